@@ -0,0 +1,317 @@
+"""Input schemas for the GoCardless MCP tools.
+
+Collected in one module and frozen behind MappingProxyType so the
+definitions are built exactly once per interpreter, cannot be mutated by
+handler code, and sit in pages that forked workers share copy-on-write.
+
+Every read tool accepts an optional ``fields`` array that projects the
+response down to just the named fields before serialization.
+"""
+
+from types import MappingProxyType
+
+LIST_CUSTOMERS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Number of customers to retrieve (default: 50)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        }
+    }
+)
+
+GET_CUSTOMER = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "customer_id": {
+                "type": "string",
+                "description": "The GoCardless customer ID (e.g., CU123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        },
+        "required": [
+            "customer_id"
+        ]
+    }
+)
+
+CREATE_CUSTOMER = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "email": {
+                "type": "string",
+                "description": "Customer email address"
+            },
+            "given_name": {
+                "type": "string",
+                "description": "Customer first name"
+            },
+            "family_name": {
+                "type": "string",
+                "description": "Customer last name"
+            },
+            "company_name": {
+                "type": "string",
+                "description": "Customer company name (optional)"
+            }
+        },
+        "required": [
+            "email"
+        ]
+    }
+)
+
+LIST_PAYMENTS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Number of payments to retrieve (default: 50)"
+            },
+            "status": {
+                "type": "string",
+                "description": "Filter by payment status (pending_customer_approval, pending_submission, submitted, confirmed, paid_out, cancelled, customer_approval_denied, failed, charged_back)"
+            },
+            "subscription": {
+                "type": "string",
+                "description": "Filter by subscription ID (e.g., SB123)"
+            },
+            "mandate": {
+                "type": "string",
+                "description": "Filter by mandate ID (e.g., MD123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        }
+    }
+)
+
+GET_PAYMENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "payment_id": {
+                "type": "string",
+                "description": "The GoCardless payment ID (e.g., PM123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        },
+        "required": [
+            "payment_id"
+        ]
+    }
+)
+
+CREATE_PAYMENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "amount": {
+                "type": "integer",
+                "description": "Amount in minor currency unit (e.g., 1000 for \u00a310.00)"
+            },
+            "currency": {
+                "type": "string",
+                "description": "ISO 4217 currency code (e.g., GBP, EUR)"
+            },
+            "mandate_id": {
+                "type": "string",
+                "description": "ID of the mandate to use for this payment"
+            },
+            "description": {
+                "type": "string",
+                "description": "Payment description"
+            }
+        },
+        "required": [
+            "amount",
+            "currency",
+            "mandate_id"
+        ]
+    }
+)
+
+LIST_MANDATES = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Number of mandates to retrieve (default: 50)"
+            },
+            "customer": {
+                "type": "string",
+                "description": "Filter by customer ID"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        }
+    }
+)
+
+GET_MANDATE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "mandate_id": {
+                "type": "string",
+                "description": "The GoCardless mandate ID (e.g., MD123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        },
+        "required": [
+            "mandate_id"
+        ]
+    }
+)
+
+LIST_SUBSCRIPTIONS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Number of subscriptions to retrieve (default: 50)"
+            },
+            "status": {
+                "type": "string",
+                "description": "Filter by subscription status"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        }
+    }
+)
+
+GET_SUBSCRIPTION = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "subscription_id": {
+                "type": "string",
+                "description": "The GoCardless subscription ID (e.g., SB123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        },
+        "required": [
+            "subscription_id"
+        ]
+    }
+)
+
+GET_SUBSCRIPTION_DETAILS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "subscription_id": {
+                "type": "string",
+                "description": "The GoCardless subscription ID (e.g., SB123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields within each of the subscription, mandate and customer sections"
+            }
+        },
+        "required": [
+            "subscription_id"
+        ]
+    }
+)
+
+GET_SUBSCRIPTION_DETAILS_BULK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "subscription_ids": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "The GoCardless subscription IDs (e.g., SB123)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields within each of the subscription, mandate and customer sections"
+            }
+        },
+        "required": [
+            "subscription_ids"
+        ]
+    }
+)
+
+LIST_PAYOUTS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Number of payouts to retrieve (default: 50)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                },
+                "description": "Optional projection: return only these fields in each result"
+            }
+        }
+    }
+)
@@ -2,23 +2,301 @@
 
 import asyncio
 import os
-from typing import Any
+import random
+import time
+import uuid
+from operator import itemgetter
+from typing import Any, Callable, Coroutine
 
-import gocardless_pro
 import mcp.server.stdio
 import mcp.types as types
+import orjson
+from aiolimiter import AsyncLimiter
 from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 
+from . import schemas
 
-def get_client() -> gocardless_pro.Client:
-    """Initialize and return GoCardless client."""
-    access_token = os.environ.get("GOCARDLESS_ACCESS_TOKEN")
-    if not access_token:
-        raise ValueError("GOCARDLESS_ACCESS_TOKEN environment variable is required")
+_API_BASE_URLS = {
+    "live": "https://api.gocardless.com",
+    "sandbox": "https://api-sandbox.gocardless.com",
+}
 
-    environment = os.environ.get("GOCARDLESS_ENVIRONMENT", "sandbox")
-    return gocardless_pro.Client(access_token=access_token, environment=environment)
+# The GoCardless API serves at most 500 records per page.
+_MAX_PAGE_SIZE = 500
+
+# Transient statuses worth retrying. 429 usually carries a Retry-After hint;
+# the 5xx entries cover gateway blips on the GoCardless side.
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_MAX_ATTEMPTS = 4
+_MAX_BACKOFF = 8.0
+# Longest Retry-After advice worth waiting out; beyond this the request
+# fails fast rather than holding the tool call (and a limiter slot) open.
+_MAX_RETRY_AFTER = 30.0
+
+# Requests allowed per minute before queuing locally. GoCardless allows
+# roughly 1000/min per merchant; the conservative default keeps a burst of
+# concurrent tool calls from tripping the limit and spiralling into
+# 429-retry loops. Override with GOCARDLESS_RATE_LIMIT.
+_DEFAULT_RATE_LIMIT = 100
+
+
+class GoCardlessApiError(Exception):
+    """Raised when the GoCardless API returns an error response."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class InvalidArgumentsError(ValueError):
+    """Raised when a tool call is missing a required argument."""
+
+
+class AsyncGCClient:
+    """Async client for the handful of GoCardless endpoints this server uses.
+
+    Replaces the synchronous gocardless_pro SDK so HTTP round-trips no
+    longer block the event loop, and keeps a shared HTTP/2 keep-alive pool
+    alive across tool calls. Records are returned as plain dicts, exactly
+    as the API serializes them.
+    """
+
+    def __init__(self, access_token: str, environment: str = "sandbox"):
+        # Deferred to first API use; this module itself then stays
+        # importable for tool discovery without the HTTP stack.
+        import httpx
+
+        self._http = httpx.AsyncClient(
+            base_url=_API_BASE_URLS[environment],
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "GoCardless-Version": "2015-07-06",
+                "Accept": "application/json",
+            },
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=30.0,
+        )
+        rate = int(os.environ.get("GOCARDLESS_RATE_LIMIT", _DEFAULT_RATE_LIMIT))
+        self._limiter = AsyncLimiter(max_rate=rate, time_period=60)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        delay = 0.5
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            # Each attempt takes a token, so retries are throttled too.
+            async with self._limiter:
+                response = await self._http.request(
+                    method, path, params=params, json=body, headers=headers
+                )
+            if response.status_code not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS:
+                break
+            # Sleep the interval the API advises when it gives one; fall
+            # back to exponential backoff with jitter so concurrent retries
+            # don't slam the rate limit in lockstep. Retrying earlier than
+            # the advised interval would only guarantee another 429, so if
+            # the advice exceeds what we're willing to wait, give up now.
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                advised = float(retry_after)
+                if advised > _MAX_RETRY_AFTER:
+                    break
+                await asyncio.sleep(advised)
+            else:
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, _MAX_BACKOFF)
+        if response.status_code >= 400:
+            try:
+                message = response.json()["error"]["message"]
+            except (KeyError, ValueError):
+                message = response.text
+            raise GoCardlessApiError(response.status_code, message)
+        return orjson.loads(response.content)
+
+    async def get(self, resource: str, resource_id: str) -> dict[str, Any]:
+        """Fetch a single record, e.g. get("customers", "CU123")."""
+        payload = await self._request("GET", f"/{resource}/{resource_id}")
+        return payload[resource]
+
+    async def create(self, resource: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Create a record; the API envelopes params under the resource key.
+
+        Every create carries a fresh Idempotency-Key so the retry loop in
+        _request cannot duplicate the record: a 502/504 after the API
+        committed the write makes the retried POST return the original
+        record instead of creating (and potentially charging) twice.
+        """
+        payload = await self._request(
+            "POST",
+            f"/{resource}",
+            body={resource: params},
+            headers={"Idempotency-Key": str(uuid.uuid4())},
+        )
+        return payload[resource]
+
+    async def list_all(
+        self, resource: str, params: dict[str, Any], limit: int
+    ) -> list[dict[str, Any]]:
+        """Collect up to ``limit`` records, following the ``after`` cursor.
+
+        A limit above the 500-per-page API maximum no longer silently
+        truncates; fetching stops as soon as enough records have arrived.
+        """
+        page_params = dict(params)
+        page_params["limit"] = min(limit, _MAX_PAGE_SIZE)
+        records: list[dict[str, Any]] = []
+        while len(records) < limit:
+            payload = await self._request("GET", f"/{resource}", params=page_params)
+            page = payload[resource]
+            records.extend(page)
+            after = payload.get("meta", {}).get("cursors", {}).get("after")
+            if not after or not page:
+                break
+            page_params["after"] = after
+        return records[:limit]
+
+
+_client: AsyncGCClient | None = None
+_client_lock = asyncio.Lock()
+
+
+async def get_client() -> AsyncGCClient:
+    """Return the shared GoCardless client, creating it on first use.
+
+    The client (and its keep-alive connection pool) is cached for the
+    lifetime of the process so TLS connections are reused across tool
+    calls instead of being re-established per request.
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                access_token = os.environ.get("GOCARDLESS_ACCESS_TOKEN")
+                if not access_token:
+                    raise ValueError(
+                        "GOCARDLESS_ACCESS_TOKEN environment variable is required"
+                    )
+
+                environment = os.environ.get("GOCARDLESS_ENVIRONMENT", "sandbox")
+                _client = AsyncGCClient(access_token, environment)
+    return _client
+
+
+# Read-through cache TTLs (seconds) per entity type. Mandates and customers
+# rarely change; subscriptions and payments a little more often; list results
+# go stale quickly as new records appear.
+_CACHE_TTLS = {
+    "customer": 600.0,
+    "mandate": 600.0,
+    "subscription": 300.0,
+    "payment": 300.0,
+    "list": 30.0,
+}
+_cache: dict[tuple[str, str], tuple[float, Any]] = {}
+
+# Upper bound on cached entries; list entries in particular can pin up to
+# _MAX_LIST_RECORDS full records each, so the cache must not grow with the
+# number of distinct filter combinations an agent tries.
+_CACHE_MAX_ENTRIES = 512
+
+
+def _evict_stale(now: float) -> None:
+    """Drop expired entries, then oldest-expiry entries if still over cap."""
+    expired = [k for k, (expires, _) in _cache.items() if expires <= now]
+    for k in expired:
+        del _cache[k]
+    if len(_cache) >= _CACHE_MAX_ENTRIES:
+        for k in sorted(_cache, key=lambda k: _cache[k][0])[
+            : len(_cache) - _CACHE_MAX_ENTRIES + 1
+        ]:
+            del _cache[k]
+
+
+async def _cached_get(
+    entity_type: str, key: str, fetch: Callable[[], Coroutine[Any, Any, Any]]
+) -> Any:
+    """Return a cached value for (entity_type, key), fetching on a miss.
+
+    Agents traversing the Customer -> Mandate -> Subscription hierarchy
+    re-read the same objects repeatedly, so short TTLs turn most of those
+    round-trips into cache hits.
+    """
+    cache_key = (entity_type, key)
+    now = time.monotonic()
+    entry = _cache.get(cache_key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    value = await fetch()
+    _evict_stale(now)
+    _cache[cache_key] = (now + _CACHE_TTLS[entity_type], value)
+    return value
+
+
+def _invalidate(entity_type: str, key: str) -> None:
+    """Drop a cached entry after a write to that entity."""
+    _cache.pop((entity_type, key), None)
+
+
+def _list_cache_key(resource: str, params: dict[str, Any]) -> str:
+    """Build a stable cache key for a list call from its filter params."""
+    return f"{resource}:{sorted(params.items())}"
+
+
+# Hard ceiling on records returned by any list_* tool, even when paginating.
+_MAX_LIST_RECORDS = 2000
+
+
+# Fields emitted per record by the list_* handlers. Each tuple is paired
+# with a prebuilt itemgetter so the per-record work is a single C-level
+# call instead of one subscript per field.
+_CUSTOMER_FIELDS = (
+    "id", "email", "given_name", "family_name", "company_name", "created_at",
+)
+_PAYMENT_FIELDS = ("id", "amount", "currency", "status", "description", "created_at")
+_MANDATE_FIELDS = ("id", "status", "scheme", "created_at")
+_SUBSCRIPTION_FIELDS = ("id", "amount", "currency", "status", "created_at")
+_PAYOUT_FIELDS = ("id", "amount", "currency", "status", "created_at")
+
+_customer_fields = itemgetter(*_CUSTOMER_FIELDS)
+_payment_fields = itemgetter(*_PAYMENT_FIELDS)
+_mandate_fields = itemgetter(*_MANDATE_FIELDS)
+_subscription_fields = itemgetter(*_SUBSCRIPTION_FIELDS)
+_payout_fields = itemgetter(*_PAYOUT_FIELDS)
+
+
+def _project(record: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """Keep only the requested fields of a record; unknown names are ignored.
+
+    Lets an agent that only needs an id or a status pay for exactly those
+    bytes (and tokens) instead of the full field set.
+    """
+    return {k: record[k] for k in fields if k in record}
+
+
+def _require(arguments: dict[str, Any], key: str) -> Any:
+    """Fetch a required tool argument or raise InvalidArgumentsError."""
+    try:
+        return arguments[key]
+    except KeyError:
+        raise InvalidArgumentsError(f"Missing required argument: {key}") from None
+
+
+# Handlers return both a text block and the same data as structured
+# content, so MCP clients that understand structuredContent can consume
+# the dict directly instead of re-parsing JSON out of the text.
+ToolResult = tuple[list[types.TextContent], dict[str, Any]]
 
 
 server = Server("gocardless-mcp")
@@ -32,552 +310,631 @@ Xero integration: metadata.xero field contains JSON string with Xero UUIDs:
 - Payments: {"invoice":"<xero-invoice-id>","payment":"<xero-payment-id>"}"""
 
 
+# Tool definitions are entirely static, so build them once at import time
+# rather than reconstructing every schema dict on each list_tools request.
+# The schemas themselves live in schemas.py as frozen mappings.
+_TOOLS = [
+    types.Tool(
+        name="list_customers",
+        description="List all customers from GoCardless",
+        inputSchema=schemas.LIST_CUSTOMERS,
+    ),
+    types.Tool(
+        name="get_customer",
+        description="Get a specific customer by ID",
+        inputSchema=schemas.GET_CUSTOMER,
+    ),
+    types.Tool(
+        name="create_customer",
+        description="Create a new customer in GoCardless",
+        inputSchema=schemas.CREATE_CUSTOMER,
+    ),
+    types.Tool(
+        name="list_payments",
+        description="List payments from GoCardless",
+        inputSchema=schemas.LIST_PAYMENTS,
+    ),
+    types.Tool(
+        name="get_payment",
+        description="Get a specific payment by ID",
+        inputSchema=schemas.GET_PAYMENT,
+    ),
+    types.Tool(
+        name="create_payment",
+        description="Create a new payment in GoCardless",
+        inputSchema=schemas.CREATE_PAYMENT,
+    ),
+    types.Tool(
+        name="list_mandates",
+        description="List mandates from GoCardless",
+        inputSchema=schemas.LIST_MANDATES,
+    ),
+    types.Tool(
+        name="get_mandate",
+        description="Get a specific mandate by ID",
+        inputSchema=schemas.GET_MANDATE,
+    ),
+    types.Tool(
+        name="list_subscriptions",
+        description="List subscriptions from GoCardless",
+        inputSchema=schemas.LIST_SUBSCRIPTIONS,
+    ),
+    types.Tool(
+        name="get_subscription",
+        description="Get subscription by ID. Returns links.mandate - use get_mandate then get_customer for full details, or use get_subscription_details instead.",
+        inputSchema=schemas.GET_SUBSCRIPTION,
+    ),
+    types.Tool(
+        name="get_subscription_details",
+        description="Get complete subscription info including mandate and customer in one call",
+        inputSchema=schemas.GET_SUBSCRIPTION_DETAILS,
+    ),
+    types.Tool(
+        name="get_subscription_details_bulk",
+        description="Get complete subscription info (subscription, mandate and customer) for multiple subscription IDs in one call",
+        inputSchema=schemas.GET_SUBSCRIPTION_DETAILS_BULK,
+    ),
+    types.Tool(
+        name="list_payouts",
+        description="List payouts from GoCardless",
+        inputSchema=schemas.LIST_PAYOUTS,
+    ),
+]
+
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available GoCardless tools."""
+    return _TOOLS
+
+
+async def _list_customers(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    limit = min(arguments.get("limit", 50), _MAX_LIST_RECORDS)
+    records = await _cached_get(
+        "list",
+        _list_cache_key("customers", {"limit": limit}),
+        lambda: client.list_all("customers", {}, limit),
+    )
+    result = [
+        dict(zip(_CUSTOMER_FIELDS, _customer_fields(customer)))
+        for customer in records
+    ]
+    if "fields" in arguments:
+        result = [_project(record, arguments["fields"]) for record in result]
     return [
-        types.Tool(
-            name="list_customers",
-            description="List all customers from GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of customers to retrieve (default: 50)",
-                    }
-                },
-            },
-        ),
-        types.Tool(
-            name="get_customer",
-            description="Get a specific customer by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The GoCardless customer ID (e.g., CU123)",
-                    }
-                },
-                "required": ["customer_id"],
-            },
-        ),
-        types.Tool(
-            name="create_customer",
-            description="Create a new customer in GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "email": {
-                        "type": "string",
-                        "description": "Customer email address",
-                    },
-                    "given_name": {
-                        "type": "string",
-                        "description": "Customer first name",
-                    },
-                    "family_name": {
-                        "type": "string",
-                        "description": "Customer last name",
-                    },
-                    "company_name": {
-                        "type": "string",
-                        "description": "Customer company name (optional)",
-                    },
-                },
-                "required": ["email"],
-            },
-        ),
-        types.Tool(
-            name="list_payments",
-            description="List payments from GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of payments to retrieve (default: 50)",
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by payment status (pending_customer_approval, pending_submission, submitted, confirmed, paid_out, cancelled, customer_approval_denied, failed, charged_back)",
-                    },
-                    "subscription": {
-                        "type": "string",
-                        "description": "Filter by subscription ID (e.g., SB123)",
-                    },
-                    "mandate": {
-                        "type": "string",
-                        "description": "Filter by mandate ID (e.g., MD123)",
-                    },
-                },
-            },
-        ),
-        types.Tool(
-            name="get_payment",
-            description="Get a specific payment by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "payment_id": {
-                        "type": "string",
-                        "description": "The GoCardless payment ID (e.g., PM123)",
-                    }
-                },
-                "required": ["payment_id"],
-            },
-        ),
-        types.Tool(
-            name="create_payment",
-            description="Create a new payment in GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "amount": {
-                        "type": "integer",
-                        "description": "Amount in minor currency unit (e.g., 1000 for £10.00)",
-                    },
-                    "currency": {
-                        "type": "string",
-                        "description": "ISO 4217 currency code (e.g., GBP, EUR)",
-                    },
-                    "mandate_id": {
-                        "type": "string",
-                        "description": "ID of the mandate to use for this payment",
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Payment description",
-                    },
-                },
-                "required": ["amount", "currency", "mandate_id"],
-            },
-        ),
-        types.Tool(
-            name="list_mandates",
-            description="List mandates from GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of mandates to retrieve (default: 50)",
-                    },
-                    "customer": {
-                        "type": "string",
-                        "description": "Filter by customer ID",
-                    },
-                },
-            },
-        ),
-        types.Tool(
-            name="get_mandate",
-            description="Get a specific mandate by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "mandate_id": {
-                        "type": "string",
-                        "description": "The GoCardless mandate ID (e.g., MD123)",
-                    }
-                },
-                "required": ["mandate_id"],
-            },
-        ),
-        types.Tool(
-            name="list_subscriptions",
-            description="List subscriptions from GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of subscriptions to retrieve (default: 50)",
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by subscription status",
-                    },
-                },
-            },
-        ),
-        types.Tool(
-            name="get_subscription",
-            description="Get subscription by ID. Returns links.mandate - use get_mandate then get_customer for full details, or use get_subscription_details instead.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "subscription_id": {
-                        "type": "string",
-                        "description": "The GoCardless subscription ID (e.g., SB123)",
-                    }
-                },
-                "required": ["subscription_id"],
-            },
-        ),
-        types.Tool(
-            name="get_subscription_details",
-            description="Get complete subscription info including mandate and customer in one call",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "subscription_id": {
-                        "type": "string",
-                        "description": "The GoCardless subscription ID (e.g., SB123)",
-                    }
-                },
-                "required": ["subscription_id"],
-            },
-        ),
-        types.Tool(
-            name="list_payouts",
-            description="List payouts from GoCardless",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of payouts to retrieve (default: 50)",
-                    }
-                },
-            },
-        ),
+        types.TextContent(
+            type="text",
+            text=f"Found {len(result)} customers:\n{_format_jsonl(result)}",
+        )
+    ], {"count": len(result), "items": result}
+
+
+async def _get_customer(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    customer_id = _require(arguments, "customer_id")
+    customer = await _cached_get(
+        "customer", customer_id, lambda: client.get("customers", customer_id)
+    )
+    result = {
+        "id": customer["id"],
+        "email": customer["email"],
+        "given_name": customer["given_name"],
+        "family_name": customer["family_name"],
+        "company_name": customer["company_name"],
+        "created_at": customer["created_at"],
+        "address_line1": customer["address_line1"],
+        "address_line2": customer["address_line2"],
+        "city": customer["city"],
+        "postal_code": customer["postal_code"],
+        "country_code": customer["country_code"],
+        "metadata": customer.get("metadata") or {},
+    }
+    if "fields" in arguments:
+        result = _project(result, arguments["fields"])
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
+
+
+async def _create_customer(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    params = {
+        "email": _require(arguments, "email"),
+    }
+    if "given_name" in arguments:
+        params["given_name"] = arguments["given_name"]
+    if "family_name" in arguments:
+        params["family_name"] = arguments["family_name"]
+    if "company_name" in arguments:
+        params["company_name"] = arguments["company_name"]
+
+    customer = await client.create("customers", params)
+    _invalidate("customer", customer["id"])
+    result = {"id": customer["id"], "email": customer["email"]}
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Customer created successfully:\n{_format_json(result)}",
+        )
+    ], result
+
+
+async def _list_payments(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    limit = min(arguments.get("limit", 50), _MAX_LIST_RECORDS)
+    params = {}
+    if "status" in arguments:
+        params["status"] = arguments["status"]
+    if "subscription" in arguments:
+        params["subscription"] = arguments["subscription"]
+    if "mandate" in arguments:
+        params["mandate"] = arguments["mandate"]
+
+    records = await _cached_get(
+        "list",
+        _list_cache_key("payments", {**params, "limit": limit}),
+        lambda: client.list_all("payments", params, limit),
+    )
+    result = [
+        dict(zip(_PAYMENT_FIELDS, _payment_fields(payment)))
+        for payment in records
+    ]
+    if "fields" in arguments:
+        result = [_project(record, arguments["fields"]) for record in result]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Found {len(result)} payments:\n{_format_jsonl(result)}",
+        )
+    ], {"count": len(result), "items": result}
+
+
+async def _get_payment(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    payment_id = _require(arguments, "payment_id")
+    payment = await _cached_get(
+        "payment", payment_id, lambda: client.get("payments", payment_id)
+    )
+    result = {
+        "id": payment["id"],
+        "amount": payment["amount"],
+        "currency": payment["currency"],
+        "status": payment["status"],
+        "description": payment["description"],
+        "created_at": payment["created_at"],
+        "charge_date": payment["charge_date"],
+        "metadata": payment.get("metadata") or {},
+        "links": {
+            "mandate": payment.get("links", {}).get("mandate"),
+            "subscription": payment.get("links", {}).get("subscription"),
+        },
+    }
+    if "fields" in arguments:
+        result = _project(result, arguments["fields"])
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
+
+
+async def _create_payment(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    params = {
+        "amount": _require(arguments, "amount"),
+        "currency": _require(arguments, "currency"),
+        "links": {"mandate": _require(arguments, "mandate_id")},
+    }
+    if "description" in arguments:
+        params["description"] = arguments["description"]
+
+    payment = await client.create("payments", params)
+    _invalidate("payment", payment["id"])
+    result = {
+        "id": payment["id"],
+        "amount": payment["amount"],
+        "currency": payment["currency"],
+        "status": payment["status"],
+    }
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Payment created successfully:\n{_format_json(result)}",
+        )
+    ], result
+
+
+async def _list_mandates(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    limit = min(arguments.get("limit", 50), _MAX_LIST_RECORDS)
+    params = {}
+    if "customer" in arguments:
+        params["customer"] = arguments["customer"]
+
+    records = await _cached_get(
+        "list",
+        _list_cache_key("mandates", {**params, "limit": limit}),
+        lambda: client.list_all("mandates", params, limit),
+    )
+    result = [
+        dict(zip(_MANDATE_FIELDS, _mandate_fields(mandate)))
+        for mandate in records
+    ]
+    if "fields" in arguments:
+        result = [_project(record, arguments["fields"]) for record in result]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Found {len(result)} mandates:\n{_format_jsonl(result)}",
+        )
+    ], {"count": len(result), "items": result}
+
+
+async def _get_mandate(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    mandate_id = _require(arguments, "mandate_id")
+    mandate = await _cached_get(
+        "mandate", mandate_id, lambda: client.get("mandates", mandate_id)
+    )
+    result = {
+        "id": mandate["id"],
+        "status": mandate["status"],
+        "scheme": mandate["scheme"],
+        "created_at": mandate["created_at"],
+        "reference": mandate["reference"],
+        "metadata": mandate.get("metadata") or {},
+        "links": {
+            "customer": mandate.get("links", {}).get("customer"),
+        },
+    }
+    if "fields" in arguments:
+        result = _project(result, arguments["fields"])
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
+
+
+async def _list_subscriptions(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    limit = min(arguments.get("limit", 50), _MAX_LIST_RECORDS)
+    params = {}
+    if "status" in arguments:
+        params["status"] = arguments["status"]
+
+    records = await _cached_get(
+        "list",
+        _list_cache_key("subscriptions", {**params, "limit": limit}),
+        lambda: client.list_all("subscriptions", params, limit),
+    )
+    result = [
+        dict(zip(_SUBSCRIPTION_FIELDS, _subscription_fields(subscription)))
+        for subscription in records
     ]
+    if "fields" in arguments:
+        result = [_project(record, arguments["fields"]) for record in result]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Found {len(result)} subscriptions:\n{_format_jsonl(result)}",
+        )
+    ], {"count": len(result), "items": result}
+
+
+async def _get_subscription(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    subscription_id = _require(arguments, "subscription_id")
+    subscription = await _cached_get(
+        "subscription",
+        subscription_id,
+        lambda: client.get("subscriptions", subscription_id),
+    )
+    result = {
+        "id": subscription["id"],
+        "amount": subscription["amount"],
+        "currency": subscription["currency"],
+        "status": subscription["status"],
+        "interval_unit": subscription["interval_unit"],
+        "interval": subscription["interval"],
+        "created_at": subscription["created_at"],
+        "name": subscription["name"],
+        "start_date": subscription["start_date"],
+        "end_date": subscription["end_date"],
+        "metadata": subscription.get("metadata") or {},
+        "links": {
+            "mandate": subscription.get("links", {}).get("mandate"),
+        },
+    }
+    if "fields" in arguments:
+        result = _project(result, arguments["fields"])
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
+
+
+def _subscription_summary(subscription: dict[str, Any]) -> dict[str, Any]:
+    """Shape a subscription record for a subscription-details response."""
+    return {
+        "id": subscription["id"],
+        "name": subscription["name"],
+        "amount": subscription["amount"],
+        "currency": subscription["currency"],
+        "status": subscription["status"],
+        "interval_unit": subscription["interval_unit"],
+        "interval": subscription["interval"],
+        "start_date": subscription["start_date"],
+        "end_date": subscription["end_date"],
+        "created_at": subscription["created_at"],
+        "metadata": subscription.get("metadata") or {},
+    }
+
+
+def _mandate_summary(mandate: dict[str, Any]) -> dict[str, Any]:
+    """Shape a mandate record for a subscription-details response."""
+    return {
+        "id": mandate["id"],
+        "reference": mandate["reference"],
+        "status": mandate["status"],
+        "scheme": mandate["scheme"],
+        "created_at": mandate["created_at"],
+        "metadata": mandate.get("metadata") or {},
+    }
+
+
+def _customer_summary(customer: dict[str, Any]) -> dict[str, Any]:
+    """Shape a customer record for a subscription-details response."""
+    return {
+        "id": customer["id"],
+        "email": customer["email"],
+        "given_name": customer["given_name"],
+        "family_name": customer["family_name"],
+        "company_name": customer["company_name"],
+        "address_line1": customer["address_line1"],
+        "address_line2": customer["address_line2"],
+        "city": customer["city"],
+        "postal_code": customer["postal_code"],
+        "country_code": customer["country_code"],
+        "created_at": customer["created_at"],
+        "metadata": customer.get("metadata") or {},
+    }
+
+
+async def _get_subscription_details(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    subscription_id = _require(arguments, "subscription_id")
+
+    # The chain is sequential by necessity (the mandate ID comes from
+    # the subscription's links, the customer ID from the mandate's),
+    # but on a repeat call all three lookups are cache hits.
+    subscription = await _cached_get(
+        "subscription",
+        subscription_id,
+        lambda: client.get("subscriptions", subscription_id),
+    )
+    mandate_id = subscription["links"]["mandate"]
+    mandate = await _cached_get(
+        "mandate", mandate_id, lambda: client.get("mandates", mandate_id)
+    )
+    customer_id = mandate["links"]["customer"]
+    customer = await _cached_get(
+        "customer", customer_id, lambda: client.get("customers", customer_id)
+    )
+
+    result = {
+        "subscription": _subscription_summary(subscription),
+        "mandate": _mandate_summary(mandate),
+        "customer": _customer_summary(customer),
+    }
+    # The composite's top-level keys are fixed; fields projects within
+    # each of the subscription/mandate/customer sections.
+    if "fields" in arguments:
+        result = {
+            section: _project(record, arguments["fields"])
+            for section, record in result.items()
+        }
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
+
+
+async def _get_subscription_details_bulk(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    subscription_ids = list(dict.fromkeys(_require(arguments, "subscription_ids")))
+
+    # Fan out each tier concurrently, deduplicating the link IDs between
+    # tiers so M subscriptions sharing one mandate or customer cost a
+    # single fetch instead of M.
+    subscriptions = await asyncio.gather(
+        *[
+            _cached_get(
+                "subscription", sid, lambda sid=sid: client.get("subscriptions", sid)
+            )
+            for sid in subscription_ids
+        ]
+    )
+
+    mandate_ids = list(
+        dict.fromkeys(s["links"]["mandate"] for s in subscriptions)
+    )
+    mandates = await asyncio.gather(
+        *[
+            _cached_get("mandate", mid, lambda mid=mid: client.get("mandates", mid))
+            for mid in mandate_ids
+        ]
+    )
+    mandates_by_id = dict(zip(mandate_ids, mandates))
+
+    customer_ids = list(
+        dict.fromkeys(m["links"]["customer"] for m in mandates)
+    )
+    customers = await asyncio.gather(
+        *[
+            _cached_get("customer", cid, lambda cid=cid: client.get("customers", cid))
+            for cid in customer_ids
+        ]
+    )
+    customers_by_id = dict(zip(customer_ids, customers))
+
+    result = []
+    for subscription in subscriptions:
+        mandate = mandates_by_id[subscription["links"]["mandate"]]
+        customer = customers_by_id[mandate["links"]["customer"]]
+        result.append(
+            {
+                "subscription": _subscription_summary(subscription),
+                "mandate": _mandate_summary(mandate),
+                "customer": _customer_summary(customer),
+            }
+        )
+    # As in _get_subscription_details, fields projects within each
+    # subscription/mandate/customer section of every entry.
+    if "fields" in arguments:
+        result = [
+            {
+                section: _project(record, arguments["fields"])
+                for section, record in entry.items()
+            }
+            for entry in result
+        ]
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], {"count": len(result), "items": result}
+
+
+async def _list_payouts(
+    client: AsyncGCClient, arguments: dict[str, Any]
+) -> ToolResult:
+    limit = min(arguments.get("limit", 50), _MAX_LIST_RECORDS)
+    records = await _cached_get(
+        "list",
+        _list_cache_key("payouts", {"limit": limit}),
+        lambda: client.list_all("payouts", {}, limit),
+    )
+    result = [
+        dict(zip(_PAYOUT_FIELDS, _payout_fields(payout)))
+        for payout in records
+    ]
+    if "fields" in arguments:
+        result = [_project(record, arguments["fields"]) for record in result]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Found {len(result)} payouts:\n{_format_jsonl(result)}",
+        )
+    ], {"count": len(result), "items": result}
+
+
+# Tool name -> handler coroutine. Dict lookup replaces the old if/elif
+# chain, and each tool gets its own small, independently testable function.
+_HANDLERS = {
+    "list_customers": _list_customers,
+    "get_customer": _get_customer,
+    "create_customer": _create_customer,
+    "list_payments": _list_payments,
+    "get_payment": _get_payment,
+    "create_payment": _create_payment,
+    "list_mandates": _list_mandates,
+    "get_mandate": _get_mandate,
+    "list_subscriptions": _list_subscriptions,
+    "get_subscription": _get_subscription,
+    "get_subscription_details": _get_subscription_details,
+    "get_subscription_details_bulk": _get_subscription_details_bulk,
+    "list_payouts": _list_payouts,
+}
+
+
+def _error_result(error_type: str, message: str, retryable: bool) -> ToolResult:
+    """Build a structured error the agent can branch on without regexes."""
+    result = {
+        "error": {"type": error_type, "message": message, "retryable": retryable}
+    }
+    return [
+        types.TextContent(type="text", text=_format_json(result))
+    ], result
 
 
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict[str, Any]
-) -> list[types.TextContent]:
+) -> ToolResult:
     """Handle tool calls for GoCardless operations."""
-    client = get_client()
-
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+
+    client = await get_client()
+    # Only API failures and bad arguments are turned into error responses;
+    # cancellation, unexpected payload shapes and genuine programming
+    # errors propagate to the SDK as internal errors.
     try:
-        if name == "list_customers":
-            limit = arguments.get("limit", 50)
-            customers = client.customers.list(params={"limit": limit})
-            result = []
-            for customer in customers.records:
-                result.append(
-                    {
-                        "id": customer.id,
-                        "email": customer.email,
-                        "given_name": customer.given_name,
-                        "family_name": customer.family_name,
-                        "company_name": customer.company_name,
-                        "created_at": customer.created_at,
-                    }
-                )
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Found {len(result)} customers:\n{_format_json(result)}",
-                )
-            ]
-
-        elif name == "get_customer":
-            customer_id = arguments["customer_id"]
-            customer = client.customers.get(customer_id)
-            result = {
-                "id": customer.id,
-                "email": customer.email,
-                "given_name": customer.given_name,
-                "family_name": customer.family_name,
-                "company_name": customer.company_name,
-                "created_at": customer.created_at,
-                "address_line1": customer.address_line1,
-                "address_line2": customer.address_line2,
-                "city": customer.city,
-                "postal_code": customer.postal_code,
-                "country_code": customer.country_code,
-                "metadata": customer.metadata if hasattr(customer, 'metadata') else {},
-            }
-            return [
-                types.TextContent(type="text", text=_format_json(result))
-            ]
+        return await handler(client, arguments)
+    except GoCardlessApiError as e:
+        if e.status_code == 429:
+            error_type = "rate_limited"
+        elif e.status_code == 404:
+            error_type = "not_found"
+        elif e.status_code == 422:
+            error_type = "validation_failed"
+        else:
+            error_type = "api_error"
+        return _error_result(
+            error_type, e.message, retryable=e.status_code in _RETRY_STATUSES
+        )
+    except InvalidArgumentsError as e:
+        return _error_result("invalid_arguments", str(e), retryable=False)
 
-        elif name == "create_customer":
-            params = {
-                "email": arguments["email"],
-            }
-            if "given_name" in arguments:
-                params["given_name"] = arguments["given_name"]
-            if "family_name" in arguments:
-                params["family_name"] = arguments["family_name"]
-            if "company_name" in arguments:
-                params["company_name"] = arguments["company_name"]
-
-            customer = client.customers.create(params=params)
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Customer created successfully:\n{_format_json({'id': customer.id, 'email': customer.email})}",
-                )
-            ]
-
-        elif name == "list_payments":
-            params = {"limit": arguments.get("limit", 50)}
-            if "status" in arguments:
-                params["status"] = arguments["status"]
-            if "subscription" in arguments:
-                params["subscription"] = arguments["subscription"]
-            if "mandate" in arguments:
-                params["mandate"] = arguments["mandate"]
-
-            payments = client.payments.list(params=params)
-            result = []
-            for payment in payments.records:
-                result.append(
-                    {
-                        "id": payment.id,
-                        "amount": payment.amount,
-                        "currency": payment.currency,
-                        "status": payment.status,
-                        "description": payment.description,
-                        "created_at": payment.created_at,
-                    }
-                )
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Found {len(result)} payments:\n{_format_json(result)}",
-                )
-            ]
-
-        elif name == "get_payment":
-            payment_id = arguments["payment_id"]
-            payment = client.payments.get(payment_id)
-            result = {
-                "id": payment.id,
-                "amount": payment.amount,
-                "currency": payment.currency,
-                "status": payment.status,
-                "description": payment.description,
-                "created_at": payment.created_at,
-                "charge_date": payment.charge_date,
-                "metadata": payment.metadata if hasattr(payment, 'metadata') else {},
-                "links": {
-                    "mandate": payment.links.mandate if hasattr(payment, 'links') and hasattr(payment.links, 'mandate') else None,
-                    "subscription": payment.links.subscription if hasattr(payment, 'links') and hasattr(payment.links, 'subscription') else None,
-                },
-            }
-            return [
-                types.TextContent(type="text", text=_format_json(result))
-            ]
-
-        elif name == "create_payment":
-            params = {
-                "amount": arguments["amount"],
-                "currency": arguments["currency"],
-                "links": {"mandate": arguments["mandate_id"]},
-            }
-            if "description" in arguments:
-                params["description"] = arguments["description"]
-
-            payment = client.payments.create(params=params)
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Payment created successfully:\n{_format_json({'id': payment.id, 'amount': payment.amount, 'currency': payment.currency, 'status': payment.status})}",
-                )
-            ]
-
-        elif name == "list_mandates":
-            params = {"limit": arguments.get("limit", 50)}
-            if "customer" in arguments:
-                params["customer"] = arguments["customer"]
-
-            mandates = client.mandates.list(params=params)
-            result = []
-            for mandate in mandates.records:
-                result.append(
-                    {
-                        "id": mandate.id,
-                        "status": mandate.status,
-                        "scheme": mandate.scheme,
-                        "created_at": mandate.created_at,
-                    }
-                )
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Found {len(result)} mandates:\n{_format_json(result)}",
-                )
-            ]
-
-        elif name == "get_mandate":
-            mandate_id = arguments["mandate_id"]
-            mandate = client.mandates.get(mandate_id)
-            result = {
-                "id": mandate.id,
-                "status": mandate.status,
-                "scheme": mandate.scheme,
-                "created_at": mandate.created_at,
-                "reference": mandate.reference,
-                "metadata": mandate.metadata if hasattr(mandate, 'metadata') else {},
-                "links": {
-                    "customer": mandate.links.customer if hasattr(mandate, 'links') else None,
-                },
-            }
-            return [
-                types.TextContent(type="text", text=_format_json(result))
-            ]
-
-        elif name == "list_subscriptions":
-            params = {"limit": arguments.get("limit", 50)}
-            if "status" in arguments:
-                params["status"] = arguments["status"]
-
-            subscriptions = client.subscriptions.list(params=params)
-            result = []
-            for subscription in subscriptions.records:
-                result.append(
-                    {
-                        "id": subscription.id,
-                        "amount": subscription.amount,
-                        "currency": subscription.currency,
-                        "status": subscription.status,
-                        "created_at": subscription.created_at,
-                    }
-                )
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Found {len(result)} subscriptions:\n{_format_json(result)}",
-                )
-            ]
-
-        elif name == "get_subscription":
-            subscription_id = arguments["subscription_id"]
-            subscription = client.subscriptions.get(subscription_id)
-            result = {
-                "id": subscription.id,
-                "amount": subscription.amount,
-                "currency": subscription.currency,
-                "status": subscription.status,
-                "interval_unit": subscription.interval_unit,
-                "interval": subscription.interval,
-                "created_at": subscription.created_at,
-                "name": subscription.name,
-                "start_date": subscription.start_date,
-                "end_date": subscription.end_date,
-                "metadata": subscription.metadata if hasattr(subscription, 'metadata') else {},
-                "links": {
-                    "mandate": subscription.links.mandate if hasattr(subscription, 'links') else None,
-                },
-            }
-            return [
-                types.TextContent(type="text", text=_format_json(result))
-            ]
-
-        elif name == "get_subscription_details":
-            subscription_id = arguments["subscription_id"]
-
-            # Get subscription
-            subscription = client.subscriptions.get(subscription_id)
-
-            # Get mandate
-            mandate = client.mandates.get(subscription.links.mandate)
-
-            # Get customer
-            customer = client.customers.get(mandate.links.customer)
-
-            result = {
-                "subscription": {
-                    "id": subscription.id,
-                    "name": subscription.name,
-                    "amount": subscription.amount,
-                    "currency": subscription.currency,
-                    "status": subscription.status,
-                    "interval_unit": subscription.interval_unit,
-                    "interval": subscription.interval,
-                    "start_date": subscription.start_date,
-                    "end_date": subscription.end_date,
-                    "created_at": subscription.created_at,
-                    "metadata": subscription.metadata if hasattr(subscription, 'metadata') else {},
-                },
-                "mandate": {
-                    "id": mandate.id,
-                    "reference": mandate.reference,
-                    "status": mandate.status,
-                    "scheme": mandate.scheme,
-                    "created_at": mandate.created_at,
-                    "metadata": mandate.metadata if hasattr(mandate, 'metadata') else {},
-                },
-                "customer": {
-                    "id": customer.id,
-                    "email": customer.email,
-                    "given_name": customer.given_name,
-                    "family_name": customer.family_name,
-                    "company_name": customer.company_name,
-                    "address_line1": customer.address_line1,
-                    "address_line2": customer.address_line2,
-                    "city": customer.city,
-                    "postal_code": customer.postal_code,
-                    "country_code": customer.country_code,
-                    "created_at": customer.created_at,
-                    "metadata": customer.metadata if hasattr(customer, 'metadata') else {},
-                },
-            }
-            return [
-                types.TextContent(type="text", text=_format_json(result))
-            ]
-
-        elif name == "list_payouts":
-            limit = arguments.get("limit", 50)
-            payouts = client.payouts.list(params={"limit": limit})
-            result = []
-            for payout in payouts.records:
-                result.append(
-                    {
-                        "id": payout.id,
-                        "amount": payout.amount,
-                        "currency": payout.currency,
-                        "status": payout.status,
-                        "created_at": payout.created_at,
-                    }
-                )
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Found {len(result)} payouts:\n{_format_json(result)}",
-                )
-            ]
 
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+def _format_json(data: Any) -> str:
+    """Format data as a pretty-printed JSON string."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
-    except Exception as e:
-        return [
-            types.TextContent(
-                type="text", text=f"Error executing {name}: {str(e)}"
-            )
-        ]
 
+def _format_jsonl(records: list[dict[str, Any]]) -> str:
+    """Format list records as JSON Lines, one compact object per line.
 
-def _format_json(data: Any) -> str:
-    """Format data as JSON string."""
-    import json
-    return json.dumps(data, indent=2)
+    Cheaper to emit than a JSON array (no shared enclosing structure to
+    build) and cheaper for an agent to consume incrementally, while the
+    per-record shape stays identical.
+    """
+    return "\n".join(orjson.dumps(record).decode() for record in records)
 
 
 async def run():
     """Run the GoCardless MCP server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        init_options = InitializationOptions(
-            server_name="gocardless-mcp",
-            server_version="0.1.0",
-            capabilities=server.get_capabilities(
-                notification_options=NotificationOptions(),
-                experimental_capabilities={},
-            ),
-        )
-        await server.run(read_stream, write_stream, init_options)
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            init_options = InitializationOptions(
+                server_name="gocardless-mcp",
+                server_version="0.1.0",
+                capabilities=server.get_capabilities(
+                    notification_options=NotificationOptions(),
+                    experimental_capabilities={},
+                ),
+            )
+            await server.run(read_stream, write_stream, init_options)
+    finally:
+        if _client is not None:
+            await _client.aclose()
 
 
 def main():
     """Entry point for the server script."""
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
     asyncio.run(run())
 
 